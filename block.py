@@ -1,11 +1,11 @@
-import io
+import struct
 import time
 from typing import List
 
 from bignum import set_compact
 from crypto import hash256
 from serialize import compact_size
-from serialize import read_compact_size
+from serialize import read_compact_size_from
 from script import CScript
 from script_utils import ScriptBuilder
 from transaction import COutPoint
@@ -13,6 +13,9 @@ from transaction import CTxIn
 from transaction import CTxOut
 from transaction import CTransaction
 
+# Little-endian header layout: nVersion, hashPrevBlock, hashMerkleRoot, nTime, nBits, nNonce
+_HEADER = struct.Struct('<I32s32sIII')
+
 
 def mine(block: 'CBlock', max_attempts=10) -> bool:
         """
@@ -90,19 +93,14 @@ class CBlockHeader:
 
     def serialize(self):
         """Serializes the block header into a byte string"""
-        stream = io.BytesIO()
-        # Version (little-endian)
-        stream.write(self.nVersion.to_bytes(4, 'little'))
-
-        # Hashes in internal byte order (no reversal)
-        stream.write(self.hashPrevBlock)
-        stream.write(self.hashMerkleRoot)
-
-        # Time, Bits, Nonce (little-endian)
-        stream.write(self.nTime.to_bytes(4, 'little'))
-        stream.write(self.nBits.to_bytes(4, 'little'))
-        stream.write(self.nNonce.to_bytes(4, 'little'))
-        return stream.getvalue()
+        # The packer pads or truncates "32s" fields silently, so check lengths
+        if len(self.hashPrevBlock) != 32:
+            raise ValueError("Invalid hashPrevBlock length (must be 32 bytes)")
+        if len(self.hashMerkleRoot) != 32:
+            raise ValueError("Invalid hashMerkleRoot length (must be 32 bytes)")
+        # Version, hashes in internal byte order (no reversal), time, bits, nonce
+        return _HEADER.pack(self.nVersion, self.hashPrevBlock, self.hashMerkleRoot,
+                            self.nTime, self.nBits, self.nNonce)
 
     @classmethod
     def deserialize(cls, stream) -> 'CBlockHeader':
@@ -146,26 +144,32 @@ class CBlock(CBlockHeader):
 
     def serialize(self):
         """Serializes the full block (header + transactions)"""
-        stream = io.BytesIO()
-        # Serialize header
-        stream.write(super().serialize())  # Use CBlockHeader's logic
-        # Serialize transactions
-        stream.write(compact_size(len(self.vtx)))
+        parts = [
+            super().serialize(),  # Use CBlockHeader's logic
+            compact_size(len(self.vtx))
+        ]
+        # Collect every transaction's fragments and join the whole block once
         for tx in self.vtx:
-            stream.write(tx.serialize())
-        return stream.getvalue()
+            tx.serialize_fragments(parts)
+        return b''.join(parts)
 
     @classmethod
     def deserialize(cls, data: bytes) -> 'CBlock':
         """Deserialize a full block from bytes (header + transactions)"""
-        stream = io.BytesIO(data)
         # Deserialize header
-        header = CBlockHeader.deserialize(stream)
-        # Deserialize transactions
-        tx_count = read_compact_size(stream)
-        vtx = [CTransaction.deserialize(stream) for _ in range(tx_count)]
+        if len(data) < _HEADER.size:
+            raise ValueError("Insufficient data for block header")
+        header = CBlockHeader(*_HEADER.unpack_from(data))
+        # Deserialize transactions, advancing a cursor through data
+        tx_count, offset = read_compact_size_from(data, _HEADER.size)
+        vtx = []
+        deserialize_tx = CTransaction.deserialize_from
+        while tx_count:
+            tx, offset = deserialize_tx(data, offset)
+            vtx.append(tx)
+            tx_count -= 1
         # Validate no extra data remains
-        if stream.read():
+        if offset != len(data):
             raise ValueError("Extra data after transactions in block")
         return cls(header, vtx)
 
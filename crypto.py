@@ -10,6 +10,7 @@ Provides common hashing operations used in Bitcoin and other cryptocurrencies:
 """
 
 import hashlib
+from typing import Optional
 from typing import Tuple
 
 try:
@@ -18,6 +19,38 @@ except ImportError:
     print("Please install the base58 library: pip install base58")
     exit()
 
+# libsecp256k1 bindings are optional; python-ecdsa is the fallback
+try:
+    import coincurve
+except ImportError:
+    coincurve = None
+
+# True when signatures are checked by libsecp256k1 rather than pure Python
+HAVE_LIBSECP256K1 = coincurve is not None
+
+# Order of the secp256k1 base point
+SECP256K1_N = 0xFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFEBAAEDCE6AF48A03BBFD25E8CD0364141
+
+# Resolve a RIPEMD-160 backend once at import time. OpenSSL 3 moved the
+# algorithm to the legacy provider, so hashlib may not offer it; in that case
+# use pycryptodome's native implementation (already a requirement).
+try:
+    hashlib.new('ripemd160')
+
+    def _ripemd160_digest(data: bytes) -> bytes:
+        return hashlib.new('ripemd160', data).digest()
+except ValueError:
+    try:
+        from Crypto.Hash import RIPEMD160
+
+        def _ripemd160_digest(data: bytes) -> bytes:
+            return RIPEMD160.new(data).digest()
+    except ImportError:
+        _ripemd160_digest = None
+
+
+_sha256 = hashlib.sha256
+
 
 def sha256(data: bytes) -> bytes:
     """Compute SHA-256 hash of the input data.
@@ -28,7 +61,7 @@ def sha256(data: bytes) -> bytes:
     Returns:
         32-byte SHA-256 hash digest
     """
-    return hashlib.sha256(data).digest()
+    return _sha256(data).digest()
 
 
 def ripemd160(data: bytes) -> bytes:
@@ -44,14 +77,14 @@ def ripemd160(data: bytes) -> bytes:
         ValueError: If RIPEMD-160 is not available on the platform
 
     Note:
-        Availability depends on the underlying OpenSSL implementation
+        Uses OpenSSL via hashlib when available, otherwise pycryptodome
     """
-    try:
-        return hashlib.new('ripemd160', data).digest()
-    except ValueError as e:
+    if _ripemd160_digest is None:
         raise ValueError(
-            "RIPEMD-160 not available. Requires OpenSSL with RIPEMD-160 support."
-        ) from e
+            "RIPEMD-160 not available. Requires OpenSSL with RIPEMD-160 support "
+            "or pycryptodome."
+        )
+    return _ripemd160_digest(data)
 
 
 def hash160(data: bytes) -> bytes:
@@ -82,9 +115,10 @@ def hash256(data: bytes) -> bytes:
         32-byte hash digest
 
     Note:
-        Standard hashing method for Bitcoin transactions and blocks
+        Standard hashing method for Bitcoin transactions and blocks.
+        Accepts any buffer (bytes, bytearray, memoryview) without copying it.
     """
-    return sha256(sha256(data))
+    return _sha256(_sha256(data).digest()).digest()
 
 
 def verify_ecdsa(pubkey: bytes, sig: bytes, data: bytes) -> bool:
@@ -92,23 +126,68 @@ def verify_ecdsa(pubkey: bytes, sig: bytes, data: bytes) -> bool:
 
     Args:
         pubkey: The public key bytes (33 or 65 bytes)
-        sig: The signature in DER format
+        sig: The signature as DER (what sign_ecdsa produces) or as 64-byte
+            r || s (the ecdsa library's raw encoding)
         data: The data that was signed (32-byte hash)
 
     Returns:
         bool: True if signature is valid, False otherwise
 
     Note:
-        This function uses the ecdsa library for verification.
+        Uses libsecp256k1 through coincurve when installed, otherwise the
+        ecdsa library.
     """
+    is_der = _is_der_signature(sig)
+    if coincurve is not None:
+        der_sig = sig if is_der else _raw_signature_to_der(sig)
+        if der_sig is None:
+            return False
+        if len(pubkey) == 64:
+            pubkey = b'\x04' + pubkey  # Raw x || y point
+        try:
+            return coincurve.PublicKey(pubkey).verify(der_sig, data, hasher=sha256)
+        except Exception:
+            return False
+
     try:
         from ecdsa import VerifyingKey, SECP256k1
+        from ecdsa.util import sigdecode_der, sigdecode_string
         vk = VerifyingKey.from_string(pubkey, curve=SECP256k1)
-        return vk.verify(sig, data, hashfunc=hashlib.sha256)
+        sigdecode = sigdecode_der if is_der else sigdecode_string
+        return vk.verify(sig, data, hashfunc=hashlib.sha256, sigdecode=sigdecode)
     except:
         return False
 
 
+def _is_der_signature(sig: bytes) -> bool:
+    """True if sig is framed as a DER SEQUENCE rather than raw r || s"""
+    return len(sig) >= 8 and sig[0] == 0x30 and sig[1] == len(sig) - 2
+
+
+def _raw_signature_to_der(sig: bytes) -> Optional[bytes]:
+    """Convert a 64-byte r || s signature to low-S DER, or None if malformed.
+
+    libsecp256k1 only accepts low-S signatures, while the ecdsa library accepts
+    both (r, s) and (r, n - s), so s is normalized before encoding.
+    """
+    if len(sig) != 64:
+        return None
+    r = int.from_bytes(sig[:32], 'big')
+    s = int.from_bytes(sig[32:], 'big')
+    if not (0 < r < SECP256K1_N and 0 < s < SECP256K1_N):
+        return None
+    if s > SECP256K1_N // 2:
+        s = SECP256K1_N - s
+
+    def der_int(value: int) -> bytes:
+        # Minimal big-endian encoding with a leading zero if the high bit is set
+        encoded = value.to_bytes(value.bit_length() // 8 + 1, 'big')
+        return b'\x02' + bytes([len(encoded)]) + encoded
+
+    body = der_int(r) + der_int(s)
+    return b'\x30' + bytes([len(body)]) + body
+
+
 def sign_ecdsa(private_key_bytes: bytes, data: bytes) -> Tuple[bytes, int]:
     """Sign data using ECDSA with secp256k1.
 
@@ -119,6 +198,14 @@ def sign_ecdsa(private_key_bytes: bytes, data: bytes) -> Tuple[bytes, int]:
     Returns:
         Tuple of (signature_bytes, recovery_id)
     """
+    if coincurve is not None:
+        try:
+            # libsecp256k1 always produces low-S (canonical) DER signatures
+            signature = coincurve.PrivateKey(private_key_bytes).sign(data, hasher=sha256)
+            return signature, 0
+        except Exception as e:
+            raise ValueError(f"Signing failed: {str(e)}")
+
     try:
         from ecdsa import SigningKey, SECP256k1
         from ecdsa.util import sigencode_der_canonize
@@ -144,6 +231,12 @@ def private_key_to_public_key(private_key_bytes: bytes, compressed: bool = True)
     Returns:
         Public key bytes (33 bytes for compressed, 65 for uncompressed)
     """
+    if coincurve is not None:
+        try:
+            return coincurve.PrivateKey(private_key_bytes).public_key.format(compressed=compressed)
+        except Exception as e:
+            raise ValueError(f"Public key derivation failed: {str(e)}")
+
     try:
         from ecdsa import SigningKey, SECP256k1
 
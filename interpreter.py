@@ -1,4 +1,13 @@
+import hashlib
+import multiprocessing
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict
 from typing import List
+from typing import Optional
+from typing import Tuple
 from typing import Union
 
 from crypto import hash256
@@ -8,6 +17,8 @@ from crypto import verify_ecdsa
 from opcodes import *
 from script import CScript
 from script import is_p2sh
+from serialize import UINT32
+from serialize import compact_size
 from transaction import CTxIn
 from transaction import CTransaction
 
@@ -23,12 +34,55 @@ def decode_num(data: bytes) -> int:
     n = int.from_bytes(data, byteorder='little', signed=True)
     return n
 
+def cast_to_bool(data: bytes) -> bool:
+    """Script truth value: any non-zero byte, except a lone sign bit (negative zero)"""
+    for i, byte in enumerate(data):
+        if byte:
+            return not (i == len(data) - 1 and byte == 0x80)
+    return False
+
+# Results pushed by comparison and signature opcodes
+_TRUE = b'\x01'
+_FALSE = b''
+
 # --------------------------
 # Script Execution Engine
 # --------------------------
 
 class ScriptExecutionError(Exception): pass
 
+# --------------------------
+# Script Verification Cache
+# --------------------------
+
+# Successful (scriptSig, scriptPubKey, tx, input) verifications, most recent last.
+# Only successes are cached so invalid inputs cannot be used to flush the cache.
+MAX_SCRIPT_CACHE_SIZE = 25000
+_script_cache: 'OrderedDict[bytes, None]' = OrderedDict()
+_script_cache_lock = threading.Lock()
+
+
+def _script_cache_key(script_sig: CScript, script_pubkey: CScript, tx_hash: bytes, input_index: int) -> bytes:
+    """Commits to everything the verification result depends on"""
+    return sha256(
+        compact_size(len(script_sig.data)) + script_sig.data +
+        compact_size(len(script_pubkey.data)) + script_pubkey.data +
+        tx_hash + input_index.to_bytes(4, 'little')
+    )
+
+
+def clear_script_cache():
+    """Drops all cached script verification results"""
+    with _script_cache_lock:
+        _script_cache.clear()
+
+
+def _script_cache_add(cache_key: bytes):
+    with _script_cache_lock:
+        _script_cache[cache_key] = None
+        if len(_script_cache) > MAX_SCRIPT_CACHE_SIZE:
+            _script_cache.popitem(last=False)
+
 
 def eval_script(ops: List[Union[int, bytes]], stack: List[bytes], tx: CTransaction, input_index: int, script_pubkey: CScript) -> bool:
     """
@@ -36,6 +90,7 @@ def eval_script(ops: List[Union[int, bytes]], stack: List[bytes], tx: CTransacti
     Returns True if execution succeeds, False on error.
     """
     op_count = 0
+    midstates = {}
     try:
         for op in ops:
             # Opcode counting and validation
@@ -45,7 +100,7 @@ def eval_script(ops: List[Union[int, bytes]], stack: List[bytes], tx: CTransacti
                     raise ScriptExecutionError("OP_COUNT_EXCEEDED")
 
             # --- Numeric Opcodes (Only if `op` is an integer) ---
-            elif isinstance(op, int) and op == OP_0:
+            if isinstance(op, int) and op == OP_0:
                 stack.append(b'')
 
             elif isinstance(op, int) and OP_1 <= op <= OP_16:
@@ -66,7 +121,7 @@ def eval_script(ops: List[Union[int, bytes]], stack: List[bytes], tx: CTransacti
             elif op == OP_VERIFY:
                 if not stack:
                     raise ScriptExecutionError("STACK_UNDERFLOW")
-                if stack.pop() == 0x00:
+                if not cast_to_bool(stack.pop()):
                     raise ScriptExecutionError("VERIFY_FAILED")
 
             elif op == OP_RETURN:
@@ -78,18 +133,15 @@ def eval_script(ops: List[Union[int, bytes]], stack: List[bytes], tx: CTransacti
                     raise ScriptExecutionError("STACK_UNDERFLOW")
                 a = stack.pop()
                 b = stack.pop()
-                stack.append(0x01 if a == b else 0x00)
+                stack.append(_TRUE if a == b else _FALSE)
 
             elif op == OP_EQUALVERIFY:
                 if len(stack) < 2:
                     raise ScriptExecutionError("STACK_UNDERFLOW")
-                # First, perform OP_EQUAL (compare and push result)
+                # OP_EQUAL followed by OP_VERIFY, without the intermediate push
                 a = stack.pop()
                 b = stack.pop()
-                stack.append(0x01 if a == b else 0x00)
-
-                # Then, perform OP_VERIFY (check top value)
-                if stack.pop() == 0x00:
+                if a != b:
                     raise ScriptExecutionError("EQUALVERIFY_FAILED")
 
             # --- Crypto Operations ---
@@ -119,22 +171,22 @@ def eval_script(ops: List[Union[int, bytes]], stack: List[bytes], tx: CTransacti
 
                 # Extract SIGHASH type (last byte)
                 if len(sig) < 1:
-                    stack.append(0x00)
+                    stack.append(_FALSE)
                     continue
                 sighash_type = sig[-1]
                 der_sig = sig[:-1]
 
                 # Compute sighash
                 try:
-                    sighash = signature_hash(tx, input_index, script_pubkey, sighash_type)
+                    sighash = signature_hash(tx, input_index, script_pubkey, sighash_type, midstates)
                 except ValueError:
-                    stack.append(0x00)
+                    stack.append(_FALSE)
                     continue
 
                 if not verify_ecdsa(pubkey, der_sig, sighash):
-                    stack.append(0x00)
+                    stack.append(_FALSE)
                 else:
-                    stack.append(0x01)
+                    stack.append(_TRUE)
 
             elif op == OP_CHECKMULTISIG:
                 # Pop n (public key count)
@@ -180,7 +232,7 @@ def eval_script(ops: List[Union[int, bytes]], stack: List[bytes], tx: CTransacti
                     # Find matching pubkey
                     for i in reversed(range(len(pubkeys_remaining))):
                         try:
-                            sighash = signature_hash(tx, input_index, script_pubkey, sighash_type)
+                            sighash = signature_hash(tx, input_index, script_pubkey, sighash_type, midstates)
                             if verify_ecdsa(pubkeys_remaining[i], der_sig, sighash):
                                 valid_sigs += 1
                                 del pubkeys_remaining[i]  # Prevent reuse
@@ -188,7 +240,7 @@ def eval_script(ops: List[Union[int, bytes]], stack: List[bytes], tx: CTransacti
                         except:
                             continue
 
-                stack.append(0x01 if valid_sigs >= m else 0x00)
+                stack.append(_TRUE if valid_sigs >= m else _FALSE)
 
             # Stack size check
             if len(stack) > CScript.MAX_STACK_SIZE:
@@ -202,7 +254,36 @@ def verify_script(script_sig: CScript, script_pubkey: CScript, tx: CTransaction,
     """
     Bitcoin v0.1 script verification logic
     Returns True if script executes successfully
+
+    Inputs that already verified successfully are answered from the script cache.
+    """
+    return verify_script_with_hash(script_sig, script_pubkey, tx, input_index, tx.get_hash())
+
+
+def verify_script_with_hash(script_sig: CScript, script_pubkey: CScript, tx: CTransaction,
+                            input_index: int, tx_hash: bytes) -> bool:
     """
+    verify_script with the transaction hash supplied by the caller, so that
+    validating several inputs of one transaction hashes it only once.
+
+    tx_hash keys the script cache and must be tx.get_hash(); a wrong value
+    could answer with another transaction's cached success.
+    """
+    cache_key = _script_cache_key(script_sig, script_pubkey, tx_hash, input_index)
+    with _script_cache_lock:
+        if cache_key in _script_cache:
+            _script_cache.move_to_end(cache_key)
+            return True
+
+    if not _verify_script(script_sig, script_pubkey, tx, input_index):
+        return False
+
+    _script_cache_add(cache_key)
+    return True
+
+
+def _verify_script(script_sig: CScript, script_pubkey: CScript, tx: CTransaction, input_index: int) -> bool:
+    """Uncached script verification"""
 
     # Check script sizes
     if (len(script_sig.data) > CScript.MAX_SCRIPT_SIZE or
@@ -228,7 +309,7 @@ def verify_script(script_sig: CScript, script_pubkey: CScript, tx: CTransaction,
             return False
 
         # Check hash validation result
-        if not stack or stack[-1] == b'\x00':
+        if not stack or not cast_to_bool(stack[-1]):
             return False
         stack.pop()  # Remove OP_EQUAL result
 
@@ -237,25 +318,132 @@ def verify_script(script_sig: CScript, script_pubkey: CScript, tx: CTransaction,
         if not eval_script(redeem_script.ops, redeem_stack, tx, input_index, redeem_script):
             return False
 
-        return bool(redeem_stack) and redeem_stack[-1] != b'\x00'
+        return bool(redeem_stack) and cast_to_bool(redeem_stack[-1])
     else:
         # Standard script execution
         if not eval_script(script_pubkey.ops, stack, tx, input_index, script_pubkey):
             return False
-        return bool(stack) and stack[-1] != b'\x00'
+        return bool(stack) and cast_to_bool(stack[-1])
+
+
+ScriptCheck = Tuple[CScript, CScript, CTransaction, int]
+
+# Worker pool shared by verify_scripts_parallel calls that don't ask for a
+# specific worker count, created on first use so importing stays cheap
+_verify_pool: Optional[ProcessPoolExecutor] = None
+_verify_pool_lock = threading.Lock()
+
+
+def _pool_context():
+    # Never fork: the node process runs threads and holds open sockets, and a
+    # forked worker would inherit both. forkserver/spawn start clean workers.
+    if 'forkserver' in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context('forkserver')
+    return multiprocessing.get_context('spawn')
+
+
+def _get_verify_pool() -> ProcessPoolExecutor:
+    global _verify_pool
+    with _verify_pool_lock:
+        if _verify_pool is None:
+            _verify_pool = ProcessPoolExecutor(max_workers=os.cpu_count() or 1,
+                                               mp_context=_pool_context())
+        return _verify_pool
+
+
+def _verify_check(check: ScriptCheck) -> bool:
+    return _verify_script(*check)
+
+
+def verify_scripts_parallel(checks: List[ScriptCheck], workers: Optional[int] = None,
+                            tx_hash: Optional[bytes] = None) -> List[bool]:
+    """
+    Verifies independent (scriptSig, scriptPubKey, tx, input_index) checks
+    across worker processes. Results are returned in the order of checks.
+
+    Checks already in the script cache are answered locally; new successes
+    from the workers are added to this process's cache. Without an explicit
+    workers count, a process pool shared across calls is used.
+
+    When every check is for the same transaction, the caller may pass its
+    tx.get_hash() as tx_hash so it is not computed again.
+    """
+    results = [False] * len(checks)
+    pending = []
+    tx_hashes = {}  # Hash each distinct transaction once
+    if tx_hash is not None and checks:
+        tx = checks[0][2]
+        if any(check[2] is not tx for check in checks):
+            raise ValueError("tx_hash given for checks of more than one transaction")
+        tx_hashes[id(tx)] = tx_hash
+    for i, (script_sig, script_pubkey, tx, input_index) in enumerate(checks):
+        tx_hash = tx_hashes.get(id(tx))
+        if tx_hash is None:
+            tx_hash = tx_hashes[id(tx)] = tx.get_hash()
+        cache_key = _script_cache_key(script_sig, script_pubkey, tx_hash, input_index)
+        with _script_cache_lock:
+            cached = cache_key in _script_cache
+        if cached:
+            results[i] = True
+        else:
+            pending.append((i, cache_key))
+
+    if workers == 1 or len(pending) < 2:
+        outcomes = [_verify_check(checks[i]) for i, _ in pending]
+    else:
+        # Signature checks are pure-Python bigint math and hold the GIL,
+        # so processes (not threads) are needed for a real speedup
+        shared = workers is None
+        workers = workers or os.cpu_count() or 1
+        chunksize = max(1, len(pending) // (4 * workers))
+        pending_checks = [checks[i] for i, _ in pending]
+        if shared:
+            outcomes = list(_get_verify_pool().map(_verify_check, pending_checks,
+                                                   chunksize=chunksize))
+        else:
+            with ProcessPoolExecutor(max_workers=workers, mp_context=_pool_context()) as pool:
+                outcomes = list(pool.map(_verify_check, pending_checks, chunksize=chunksize))
+
+    for (i, cache_key), ok in zip(pending, outcomes):
+        if ok:
+            _script_cache_add(cache_key)
+        results[i] = ok
+    return results
 
 # --------------------------
 # Signature Verification
 # --------------------------
 
-def signature_hash(tx: CTransaction, input_index: int, script_pubkey: CScript, sighash_type: int) -> bytes:
+def signature_hash(tx: CTransaction, input_index: int, script_pubkey: CScript, sighash_type: int,
+                   midstates: Optional[Dict] = None) -> bytes:
     """
     Calculates the signature hash for transaction verification
+
+    If a midstates dict is given, the SHA-256 state after absorbing the modified
+    transaction is stored there and reused by later calls that differ only in the
+    trailing sighash type word. The dict must not outlive changes to tx.
     """
     # Validate input index
     if input_index < 0 or input_index >= len(tx.vin):
         raise ValueError("Invalid input index")
 
+    midstate_key = (input_index, script_pubkey.data, sighash_type & (SIGHASH_ANYONECANPAY | 0x1f))
+    midstate = midstates.get(midstate_key) if midstates is not None else None
+    if midstate is None:
+        midstate = _sighash_midstate(tx, input_index, script_pubkey, sighash_type)
+        if isinstance(midstate, bytes):
+            return midstate  # SIGHASH_SINGLE without a matching output
+        if midstates is not None:
+            midstates[midstate_key] = midstate
+
+    inner = midstate.copy()
+    inner.update(UINT32.pack(sighash_type))
+    return sha256(inner.digest())
+
+
+def _sighash_midstate(tx: CTransaction, input_index: int, script_pubkey: CScript, sighash_type: int):
+    """SHA-256 state over the transaction copy that sighash_type commits to"""
+
     # Extract SIGHASH flags
     sighash_anyonecanpay = (sighash_type & SIGHASH_ANYONECANPAY) != 0
     base_type = sighash_type & 0x1f  # Mask off ANYONECANPAY bit
@@ -293,5 +481,4 @@ def signature_hash(tx: CTransaction, input_index: int, script_pubkey: CScript, s
 
     # Build modified transaction
     tx_copy = CTransaction(vin=vin, vout=vout, nLockTime=tx.nLockTime)
-    preimage = tx_copy.serialize() + sighash_type.to_bytes(4, 'little')
-    return hash256(preimage)
+    return hashlib.sha256(tx_copy.serialize())
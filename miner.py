@@ -101,8 +101,8 @@ class Miner:
             for txin in tx.vin:
                 # Find the UTXO being spent
                 prevout = txin.prevout
-                if prevout in self.chain_state.utxo_set.utxos:
-                    utxo = self.chain_state.utxo_set.utxos[prevout]
+                utxo = self.chain_state.utxo_set.get(prevout)
+                if utxo is not None:
                     input_sum += utxo.tx_out.nValue
 
             # Calculate output values
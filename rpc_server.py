@@ -9,6 +9,7 @@ from typing import List, Dict, Callable, Any, Optional
 from urllib.parse import urlparse, parse_qs
 import threading
 import time
+from decimal import Decimal
 
 from bignum import set_compact
 from block import CBlock
@@ -110,6 +111,19 @@ def script_to_address(script_pubkey: CScript) -> str:
         return ""  # Return empty string for unsupported script types
 
 
+def amount_to_satoshis(amount) -> int:
+    """
+    Convert a BTC amount from a request (JSON number or string) to satoshis.
+
+    Goes through Decimal on the amount's shortest repr, so e.g. 0.29 becomes
+    29000000 rather than the 28999999 that float multiplication truncates to.
+    """
+    satoshis = Decimal(str(amount)).scaleb(8)
+    if satoshis != satoshis.to_integral_value():
+        raise ValueError(f"Amount has more than 8 decimal places: {amount}")
+    return int(satoshis)
+
+
 class JSONRPCError(Exception):
     """JSON-RPC 2.0 standard error"""
     def __init__(self, code: int, message: str, data: Any = None):
@@ -466,7 +480,7 @@ class JSONRPCServer:
             'txid': tx.get_hash().hex(),
             'hash': tx.get_hash().hex(),
             'version': tx.nVersion,
-            'size': len(tx.serialize()),
+            'size': tx.serialized_size(),
             'locktime': tx.nLockTime,
             'vin': [{
                 'txid': vin.prevout.hash.hex(),
@@ -540,7 +554,8 @@ class JSONRPCServer:
                     # Skip invalid addresses but continue processing
                     continue
 
-        for prevout, utxo in self.chain_state.utxo_set.utxos.items():
+        for utxo in self.chain_state.utxo_set.utxos.values():
+            prevout = utxo.prevout
             confirmations = current_height - utxo.height + 1
             if minconf <= confirmations <= maxconf:
                 # Convert scriptPubKey to address (for response)
@@ -603,7 +618,7 @@ class JSONRPCServer:
 
         return {
             'size': len(self.chain_state.mempool),
-            'bytes': sum(len(tx.serialize()) for tx in self.chain_state.mempool.values()),
+            'bytes': sum(tx.serialized_size() for tx in self.chain_state.mempool.values()),
             'usage': 0,  # Would need actual memory usage tracking
             'maxmempool': 300000000,  # Default value
             'mempoolminfee': 0.00001000,
@@ -620,7 +635,7 @@ class JSONRPCServer:
             prevout = COutPoint(tx_hash, n)
 
             if self.chain_state.utxo_set.is_unspent(prevout):
-                utxo = self.chain_state.utxo_set.utxos[prevout]
+                utxo = self.chain_state.utxo_set.get(prevout)
                 current_height = self.chain_state.chain.tip.height
 
                 return {
@@ -654,7 +669,7 @@ class JSONRPCServer:
             vout = []
             for address, amount in outputs.items():
                 # Convert amount to satoshis
-                nValue = int(amount * 100_000_000)
+                nValue = amount_to_satoshis(amount)
                 # Create scriptPubKey from address
                 scriptPubKey = address_to_script(address)
                 vout.append(CTxOut(nValue, scriptPubKey))
@@ -736,8 +751,8 @@ class JSONRPCServer:
                         utxo_info = prev_tx_map[prevtx_key]
                     else:
                         # Try to find in UTXO set
-                        if self.chain_state and prevout in self.chain_state.utxo_set.utxos:
-                            utxo = self.chain_state.utxo_set.utxos[prevout]
+                        utxo = self.chain_state.utxo_set.get(prevout) if self.chain_state else None
+                        if utxo is not None:
                             utxo_info = {
                                 'scriptPubKey': utxo.tx_out.scriptPubKey.data.hex(),
                                 'value': utxo.tx_out.nValue / 100_000_000  # Convert to BTC
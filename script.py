@@ -80,8 +80,16 @@ class CScript:
 # Helper functions
 # --------------------------
 
+# Canonical P2SH byte template: OP_HASH160 <push 20> <20-byte hash> OP_EQUAL
+_P2SH_SIZE = 23
+_P2SH_PREFIX = bytes([OP_HASH160, 20])
+
+
 def is_op_return(script_pubkey: CScript) -> bool:
     """Check if script is an OP_RETURN scriptPubKey."""
+    data = script_pubkey.data
+    if not data or data[0] != OP_RETURN:
+        return False  # Reject on the first byte without walking the ops
     ops = script_pubkey.ops
     return (len(ops) >= 1 and
             ops[0] == OP_RETURN and
@@ -90,6 +98,10 @@ def is_op_return(script_pubkey: CScript) -> bool:
 
 def is_p2sh(script_pubkey: CScript) -> bool:
     """Check if script is a P2SH scriptPubKey."""
+    data = script_pubkey.data
+    if len(data) == _P2SH_SIZE and data.startswith(_P2SH_PREFIX) and data[-1] == OP_EQUAL:
+        return True
+    # Non-canonical pushes of the hash (e.g. via OP_PUSHDATA1) still match on ops
     ops = script_pubkey.ops
     return (len(ops) == 3 and
             ops[0] == OP_HASH160 and
@@ -1,4 +1,5 @@
 import hashlib
+import itertools
 
 from ecdsa import SigningKey
 from ecdsa import SECP256k1
@@ -14,6 +15,30 @@ from transaction import COutPoint
 from transaction import CTxIn
 from transaction import CTxOut
 from transaction import CTransaction
+from wallet import Wallet
+
+# --------------------------
+# Test Keys
+# --------------------------
+
+# Key identity does not matter for these examples, so keys are generated once
+# and handed out round-robin instead of paying for generation on every use.
+_KEY_POOL_SIZE = 16
+_key_pool: list[SigningKey] = []
+_key_counter = itertools.count()
+
+
+def _get_test_key() -> SigningKey:
+    """Returns the next key from the shared pool, generating it on first use"""
+    index = next(_key_counter) % _KEY_POOL_SIZE
+    if index == len(_key_pool):
+        _key_pool.append(SigningKey.generate(curve=SECP256k1))
+    return _key_pool[index]
+
+
+# Right length for a raw signature plus sighash byte, but not a valid signature;
+# every spend built with it must fail verification
+_GARBAGE_SIG = b'\x01' * 65
 
 # --------------------------
 # Example Usage
@@ -22,7 +47,7 @@ from transaction import CTransaction
 if __name__ == "__main__":
     print("\n--- P2PK Test Case ---")
     # Generate key pair
-    sk = SigningKey.generate(curve=SECP256k1)
+    sk = _get_test_key()
     vk = sk.get_verifying_key()
     pubkey = vk.to_string("compressed")
 
@@ -39,7 +64,7 @@ if __name__ == "__main__":
 
     # Sign transaction
     sighash = signature_hash(tx, 0, script_pubkey, SIGHASH_ALL)
-    signature = sk.sign(sighash, hashfunc=hashlib.sha256)
+    signature = sk.sign(sighash, hashfunc=hashlib.sha256) + bytes([SIGHASH_ALL])
 
     # Build scriptSig (push 71-byte signature)
     # push_sig = bytes([OP_PUSHDATA1, len(signature)]) + signature
@@ -51,6 +76,8 @@ if __name__ == "__main__":
     print(f"ScriptPubKey: {script_pubkey}")
     print(f"ScriptSig: {script_sig}")
     print("Verification:", verify_script(script_sig, script_pubkey, tx, 0))  # Output: True
+    bad_script_sig = ScriptBuilder.p2pk_script_sig(_GARBAGE_SIG)
+    print("Garbage signature:", verify_script(bad_script_sig, script_pubkey, tx, 0))  # Output: False
 
     print("\n--- P2PKH Test Case ---")
     # Generate pubkey hash
@@ -72,7 +99,7 @@ if __name__ == "__main__":
 
     # Sign transaction
     sighash = signature_hash(tx, 0, script_pubkey, SIGHASH_ALL)
-    signature = sk.sign(sighash, hashfunc=hashlib.sha256)
+    signature = sk.sign(sighash, hashfunc=hashlib.sha256) + bytes([SIGHASH_ALL])
 
     # Build scriptSig (push sig + pubkey)
     # push_sig = bytes([OP_PUSHDATA1, len(signature)]) + signature
@@ -85,18 +112,20 @@ if __name__ == "__main__":
     print(f"ScriptPubKey: {script_pubkey}")
     print(f"ScriptSig: {script_sig}")
     print("Verification:", verify_script(script_sig, script_pubkey, tx, 0))  # Output: True
+    bad_script_sig = ScriptBuilder.p2pkh_script_sig(_GARBAGE_SIG, pubkey)
+    print("Garbage signature:", verify_script(bad_script_sig, script_pubkey, tx, 0))  # Output: False
 
     print("\n --- P2MS Test Case ---")
     # Generate 3 key pairs
-    sk1 = SigningKey.generate(curve=SECP256k1)
+    sk1 = _get_test_key()
     vk1 = sk1.get_verifying_key()
     pubkey1 = vk1.to_string("compressed")
 
-    sk2 = SigningKey.generate(curve=SECP256k1)
+    sk2 = _get_test_key()
     vk2 = sk2.get_verifying_key()
     pubkey2 = vk2.to_string("compressed")
 
-    sk3 = SigningKey.generate(curve=SECP256k1)
+    sk3 = _get_test_key()
     vk3 = sk3.get_verifying_key()
     pubkey3 = vk3.to_string("compressed")
 
@@ -118,9 +147,7 @@ if __name__ == "__main__":
     )
 
     # Sign with 2 keys
-    sighash = signature_hash(tx, 0, script_pubkey, SIGHASH_ALL)
-    sig1 = sk1.sign(sighash, hashfunc=hashlib.sha256)
-    sig2 = sk2.sign(sighash, hashfunc=hashlib.sha256)
+    sig1, sig2 = Wallet.sign_multi(tx, 0, script_pubkey, SIGHASH_ALL, [sk1, sk2])
 
     # Build scriptSig (OP_0 + sig1 + sig2)
     # script_sig = CScript(
@@ -135,14 +162,16 @@ if __name__ == "__main__":
     print(f"ScriptPubKey: {script_pubkey}")
     print(f"ScriptSig: {script_sig}")
     print("Verification:", verify_script(script_sig, script_pubkey, tx, 0))  # Output: True
+    bad_script_sig = ScriptBuilder.p2ms_script_sig(sig1, _GARBAGE_SIG)
+    print("Garbage signature:", verify_script(bad_script_sig, script_pubkey, tx, 0))  # Output: False
 
     print("\n --- P2SH Test Case ---")
     # Generate 2-of-2 multisig redeem script
-    sk1 = SigningKey.generate(curve=SECP256k1)
+    sk1 = _get_test_key()
     vk1 = sk1.get_verifying_key()
     pubkey1 = vk1.to_string("compressed")
 
-    sk2 = SigningKey.generate(curve=SECP256k1)
+    sk2 = _get_test_key()
     vk2 = sk2.get_verifying_key()
     pubkey2 = vk2.to_string("compressed")
 
@@ -169,9 +198,8 @@ if __name__ == "__main__":
     )
 
     # Sign with both keys
-    sighash = signature_hash(tx, 0, redeem_script, SIGHASH_ALL)  # Note: redeem_script used for sighash
-    sig1 = sk1.sign(sighash, hashfunc=hashlib.sha256) + bytes([SIGHASH_ALL])
-    sig2 = sk2.sign(sighash, hashfunc=hashlib.sha256) + bytes([SIGHASH_ALL])
+    # Note: redeem_script used for sighash
+    sig1, sig2 = Wallet.sign_multi(tx, 0, redeem_script, SIGHASH_ALL, [sk1, sk2])
 
     # Build scriptSig with signatures and redeem script
     # script_sig = CScript(
@@ -187,10 +215,12 @@ if __name__ == "__main__":
     print(f"ScriptPubKey: {script_pubkey}")
     print(f"ScriptSig: {script_sig}")
     print("Verification:", verify_script(script_sig, script_pubkey, tx, 0))  # Should output True
+    bad_script_sig = ScriptBuilder.p2sh_script_sig(redeem_script, bytes(OP_0), _GARBAGE_SIG, sig2)
+    print("Garbage signature:", verify_script(bad_script_sig, script_pubkey, tx, 0))  # Output: False
 
     print("\n--- OP_RETURN Test Case ---")
     # Generate key pair for the change output
-    sk = SigningKey.generate(curve=SECP256k1)
+    sk = _get_test_key()
     vk = sk.get_verifying_key()
     pubkey = vk.to_string("compressed")
     pubkey_hash = ripemd160(sha256(pubkey))
@@ -215,7 +245,7 @@ if __name__ == "__main__":
 
     # Sign transaction (only needed for the spendable output)
     sighash = signature_hash(tx, 0, change_script, SIGHASH_ALL)
-    signature = sk.sign(sighash, hashfunc=hashlib.sha256)
+    signature = sk.sign(sighash, hashfunc=hashlib.sha256) + bytes([SIGHASH_ALL])
 
     # Build scriptSig for the input
     script_sig = ScriptBuilder.p2pkh_script_sig(signature, pubkey)
@@ -227,6 +257,8 @@ if __name__ == "__main__":
     print(f"ScriptSig: {script_sig}")
     print(f"Embedded data: {data_to_embed.decode('utf-8')}")
     print("Verification:", verify_script(script_sig, change_script, tx, 0))  # Should output True
+    bad_script_sig = ScriptBuilder.p2pkh_script_sig(_GARBAGE_SIG, pubkey)
+    print("Garbage signature:", verify_script(bad_script_sig, change_script, tx, 0))  # Output: False
 
     # Verify the OP_RETURN output has 0 value
     # print(f"OP_RETURN value: {tx.vout[0].nValue} satoshis (must be 0)")
@@ -1,9 +1,36 @@
+import functools
 from typing import List
 from typing import Union
 
 from crypto import hash160
 from opcodes import *
 from script import CScript
+from serialize import UINT16
+from serialize import UINT32
+
+# One-byte scripts for every opcode, plus fixed template fragments
+_OPCODE_BYTES = tuple(bytes([op]) for op in range(0x100))
+_P2PKH_HEAD = bytes([OP_DUP, OP_HASH160])
+_P2PKH_TAIL = bytes([OP_EQUALVERIFY, OP_CHECKSIG])
+
+# Push prefixes for every length that fits in a direct push or OP_PUSHDATA1
+_PUSH_PREFIX = (
+    [_OPCODE_BYTES[OP_0]] +
+    [_OPCODE_BYTES[length] for length in range(1, OP_PUSHDATA1)] +
+    [bytes([OP_PUSHDATA1, length]) for length in range(OP_PUSHDATA1, 0x100)]
+)
+
+
+# HASH160 results for recently seen pubkeys / redeem scripts
+@functools.lru_cache(maxsize=4096)
+def _hash160_bytes(data: bytes) -> bytes:
+    return hash160(data)
+
+
+def _cached_hash160(data: bytes) -> bytes:
+    """HASH160 of data, memoized across builder calls"""
+    # Normalize so bytearray/memoryview input can key the cache
+    return _hash160_bytes(bytes(data))
 
 
 class ScriptBuilder:
@@ -11,16 +38,12 @@ class ScriptBuilder:
     def _push_data(data: bytes) -> bytes:
         """Generate proper push opcodes for data"""
         length = len(data)
-        if length == 0:
-            return bytes([OP_0])
-        elif length <= 75:
-            return bytes([length]) + data
-        elif length <= 0xff:
-            return bytes([OP_PUSHDATA1, length]) + data
+        if length <= 0xff:
+            return _PUSH_PREFIX[length] + data
         elif length <= 0xffff:
-            return bytes([OP_PUSHDATA2]) + length.to_bytes(2, 'little') + data
+            return _OPCODE_BYTES[OP_PUSHDATA2] + UINT16.pack(length) + data
         else:
-            return bytes([OP_PUSHDATA4]) + length.to_bytes(4, 'little') + data
+            return _OPCODE_BYTES[OP_PUSHDATA4] + UINT32.pack(length) + data
 
     @classmethod
     def p2pk_script_pubkey(cls, pubkey: bytes) -> CScript:
@@ -29,7 +52,7 @@ class ScriptBuilder:
             raise ValueError("Invalid public key length (must be 33/65 bytes)")
         
         push_pubkey = cls._push_data(pubkey)
-        return CScript(push_pubkey + bytes([OP_CHECKSIG]))
+        return CScript(push_pubkey + _OPCODE_BYTES[OP_CHECKSIG])
 
     @classmethod
     def p2pkh_script_pubkey(cls, pubkey_or_hash: bytes, is_hash: bool = False) -> CScript:
@@ -41,12 +64,12 @@ class ScriptBuilder:
         else:
             if len(pubkey_or_hash) not in {33, 65}:
                 raise ValueError("Invalid public key length (must be 33/65 bytes)")
-            pubkey_hash = hash160(pubkey_or_hash)
+            pubkey_hash = _cached_hash160(pubkey_or_hash)
 
         return CScript(
-            bytes([OP_DUP, OP_HASH160]) +
+            _P2PKH_HEAD +
             cls._push_data(pubkey_hash) +
-            bytes([OP_EQUALVERIFY, OP_CHECKSIG])
+            _P2PKH_TAIL
         )
 
     @classmethod
@@ -57,12 +80,11 @@ class ScriptBuilder:
         if len(pubkeys) < m or len(pubkeys) > 16:
             raise ValueError("Invalid number of pubkeys (1-16)")
 
-        script = bytes([OP_1 + m - 1])  # Convert to OP_1-OP_16
-        for pk in pubkeys:
-            script += cls._push_data(pk)
-        script += bytes([OP_1 + len(pubkeys) - 1, OP_CHECKMULTISIG])
-        
-        return CScript(script)
+        parts = [_OPCODE_BYTES[OP_1 + m - 1]]  # Convert to OP_1-OP_16
+        parts.extend(cls._push_data(pk) for pk in pubkeys)
+        parts.append(bytes([OP_1 + len(pubkeys) - 1, OP_CHECKMULTISIG]))
+
+        return CScript(b''.join(parts))
 
     @classmethod
     def p2sh_script_pubkey(cls, script_or_hash: Union[CScript, bytes], is_hash: bool = False) -> CScript:
@@ -74,12 +96,12 @@ class ScriptBuilder:
         else:
             if not isinstance(script_or_hash, CScript):
                 raise ValueError("P2SH requires CScript")
-            script_hash = hash160(script_or_hash.data)
+            script_hash = _cached_hash160(script_or_hash.data)
 
         return CScript(
-            bytes([OP_HASH160]) +
+            _OPCODE_BYTES[OP_HASH160] +
             cls._push_data(script_hash) +
-            bytes([OP_EQUAL])
+            _OPCODE_BYTES[OP_EQUAL]
         )
 
     @classmethod
@@ -89,7 +111,7 @@ class ScriptBuilder:
             raise ValueError("OP_RETURN data exceeds 80 bytes")
 
         return CScript(
-            bytes([OP_RETURN]) +
+            _OPCODE_BYTES[OP_RETURN] +
             cls._push_data(data)
         )
 
@@ -109,16 +131,13 @@ class ScriptBuilder:
     @classmethod
     def p2ms_script_sig(cls, *signatures: bytes) -> CScript:
         """Build scriptSig for P2MS (dummy OP_0 + signatures)"""
-        script = bytes([OP_0])  # Required for multisig off-by-one bug
-        for sig in signatures:
-            script += cls._push_data(sig)
-        return CScript(script)
+        parts = [_OPCODE_BYTES[OP_0]]  # Required for multisig off-by-one bug
+        parts.extend(cls._push_data(sig) for sig in signatures)
+        return CScript(b''.join(parts))
 
     @classmethod
     def p2sh_script_sig(cls, redeem_script: CScript, *unlocking_data: bytes) -> CScript:
         """Build scriptSig for P2SH (unlocking data + redeem script)"""
-        script = b''
-        for data in unlocking_data:
-            script += cls._push_data(data)
-        script += cls._push_data(redeem_script.data)
-        return CScript(script)
+        parts = [cls._push_data(data) for data in unlocking_data]
+        parts.append(cls._push_data(redeem_script.data))
+        return CScript(b''.join(parts))
@@ -1,3 +1,12 @@
+import struct
+
+UINT16 = struct.Struct('<H')
+UINT32 = struct.Struct('<I')
+UINT64 = struct.Struct('<Q')
+
+# Encodings of every value that fits the single-byte compact size form
+SMALL_COMPACT_SIZES = tuple(bytes([value]) for value in range(0xfd))
+
 
 def compact_size(value: int) -> bytes:
     """Convert an integer to Bitcoin-style compact size encoding (also known as "varint").
@@ -17,17 +26,28 @@ def compact_size(value: int) -> bytes:
     Raises:
         ValueError: If input is negative
     """
-    if value < 0:
+    if 0 <= value < 0xfd:
+        return SMALL_COMPACT_SIZES[value]  # Common case: counts and script sizes
+    elif value < 0:
         raise ValueError("Compact size cannot encode negative values")
+    elif value <= 0xffff:
+        return b'\xfd' + UINT16.pack(value)
+    elif value <= 0xffffffff:
+        return b'\xfe' + UINT32.pack(value)
+    else:
+        return b'\xff' + UINT64.pack(value)
+
 
+def compact_size_len(value: int) -> int:
+    """Number of bytes compact_size(value) produces, without encoding it"""
     if value < 0xfd:
-        return value.to_bytes(1, 'little')
+        return 1
     elif value <= 0xffff:
-        return b'\xfd' + value.to_bytes(2, 'little')
+        return 3
     elif value <= 0xffffffff:
-        return b'\xfe' + value.to_bytes(4, 'little')
+        return 5
     else:
-        return b'\xff' + value.to_bytes(8, 'little')
+        return 9
 
 
 def read_compact_size(stream):
@@ -55,3 +75,21 @@ def read_compact_size(stream):
         return int.from_bytes(data, 'little')
     else:
         raise ValueError("Invalid compact size prefix")
+
+
+def read_compact_size_from(buf: bytes, offset: int) -> tuple[int, int]:
+    """Decode a compact size at buf[offset], returning (value, offset past it)."""
+    if offset >= len(buf):
+        raise ValueError("Unexpected end of data")
+    size_byte = buf[offset]
+    if size_byte < 0xfd:
+        return size_byte, offset + 1
+    try:
+        if size_byte == 0xfd:
+            return UINT16.unpack_from(buf, offset + 1)[0], offset + 3
+        elif size_byte == 0xfe:
+            return UINT32.unpack_from(buf, offset + 1)[0], offset + 5
+        else:
+            return UINT64.unpack_from(buf, offset + 1)[0], offset + 9
+    except struct.error:
+        raise ValueError("Insufficient data for compact size") from None
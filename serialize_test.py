@@ -0,0 +1,99 @@
+import io
+
+from block import CBlock
+from block import CBlockHeader
+from block import create_coinbase_transaction
+from script import CScript
+from serialize import compact_size
+from serialize import compact_size_len
+from serialize import read_compact_size
+from serialize import read_compact_size_from
+from transaction import COutPoint
+from transaction import CTxIn
+from transaction import CTxOut
+from transaction import CTransaction
+
+# --------------------------
+# Helpers
+# --------------------------
+
+def make_transaction(script_size: int, n_inputs: int = 1) -> CTransaction:
+    """Transaction whose scripts are script_size bytes, spending n_inputs outpoints"""
+    return CTransaction(
+        nVersion=2,
+        vin=[CTxIn(COutPoint(bytes([i % 256]) * 32, i), CScript(b'\x51' * script_size), 0xfffffffe)
+             for i in range(n_inputs)],
+        vout=[CTxOut(5000000000, CScript(b'\x6a' * script_size))],
+        nLockTime=600000
+    )
+
+
+def round_trips(tx: CTransaction) -> bool:
+    """serialize -> deserialize -> serialize gives the same bytes, by either decoder"""
+    raw = tx.serialize()
+    from_bytes = CTransaction.deserialize(raw)
+    from_stream = CTransaction.deserialize(io.BytesIO(raw))
+    return from_bytes.serialize() == raw and from_stream.serialize() == raw
+
+
+def rejects_truncation(decode, raw: bytes) -> bool:
+    """Every strict prefix of raw raises ValueError when decoded"""
+    for end in range(len(raw)):
+        try:
+            decode(raw[:end])
+        except ValueError:
+            continue
+        return False
+    return True
+
+
+# --------------------------
+# Example Usage
+# --------------------------
+
+if __name__ == "__main__":
+    print("=== Compact Sizes ===")
+    for value in (0, 0xfc, 0xfd, 0xffff, 0x10000, 0xffffffff, 0x100000000):
+        encoded = compact_size(value)
+        decoded_stream = read_compact_size(io.BytesIO(encoded))
+        decoded_buf = read_compact_size_from(encoded, 0)
+        print(f"{value:#x}: {encoded.hex()} "
+              f"{decoded_stream == value and decoded_buf == (value, len(encoded)) and compact_size_len(value) == len(encoded)}")
+    print(f"Truncated 0xfd prefix rejected: {rejects_truncation(lambda b: read_compact_size_from(b, 0), compact_size(0xfd))}")
+
+    print("\n=== Transaction Round Trip ===")
+    # Script sizes either side of the 1-byte/3-byte compact size boundary, up to
+    # the largest script CScript allows
+    for script_size in (0, 0xfc, 0xfd, CScript.MAX_SCRIPT_SIZE):
+        tx = make_transaction(script_size)
+        raw = tx.serialize()
+        print(f"Script size {script_size:#x}: round trip {round_trips(tx)}, "
+              f"serialized_size {tx.serialized_size() == len(raw)}")
+    # Input counts past the 1-byte and 3-byte compact size forms
+    for n_inputs in (0xfd, 0x10000):
+        tx = make_transaction(1, n_inputs=n_inputs)
+        print(f"{n_inputs:#x} inputs: round trip {round_trips(tx)}, "
+              f"serialized_size {tx.serialized_size() == len(tx.serialize())}")
+
+    print("\n=== Transaction Truncation ===")
+    raw = make_transaction(0xfd).serialize()
+    print(f"Every truncated prefix raises ValueError: {rejects_truncation(CTransaction.deserialize, raw)}")
+
+    print("\n=== Block Round Trip ===")
+    coinbase = create_coinbase_transaction(CScript(b'\x03\x01\x02\x03'), 5000000000, CScript(b'\x51'))
+    block = CBlock(
+        header=CBlockHeader(nVersion=1, hashPrevBlock=bytes(32), hashMerkleRoot=bytes(32),
+                            nTime=1700000000, nBits=0x1f00ffff, nNonce=0),
+        vtx=[coinbase, make_transaction(0xfd), make_transaction(2, n_inputs=3)]
+    )
+    block.hashMerkleRoot = block.build_merkle_root()
+    raw_block = block.serialize()
+    decoded = CBlock.deserialize(raw_block)
+    print(f"Round trip: {decoded.serialize() == raw_block}")
+    print(f"Same hash: {decoded.get_hash() == block.get_hash()}")
+    print(f"Every truncated prefix raises ValueError: {rejects_truncation(CBlock.deserialize, raw_block)}")
+    try:
+        CBlock.deserialize(raw_block + b'\x00')
+        print("Trailing data rejected: False")
+    except ValueError:
+        print("Trailing data rejected: True")
@@ -1,23 +1,52 @@
 import io
+import struct
+from typing import Optional
 
 from crypto import hash256
+from serialize import UINT32
+from serialize import UINT64
+from serialize import SMALL_COMPACT_SIZES
 from serialize import compact_size
+from serialize import compact_size_len
 from serialize import read_compact_size
+from serialize import read_compact_size_from
 from script import CScript
 
+_OUTPOINT = struct.Struct('<32sI')
+# Fixed-size heads of inputs and outputs, up to the first script size byte
+_TXIN_HEAD = struct.Struct('<32sIB')
+_TXOUT_HEAD = struct.Struct('<QB')
+
+# nSequence of a final (non-replaceable) input, by far the most common value
+SEQUENCE_FINAL = 0xffffffff
+_SEQUENCE_FINAL_BYTES = UINT32.pack(SEQUENCE_FINAL)
+
 
 class COutPoint:
+    # Outpoints are treated as immutable (they key the UTXO set), so the
+    # serialization and hash are memoized on first use
+    __slots__ = ('hash', 'n', '_serialized', '_hash_value')
+
     def __init__(self, hash: bytes = bytes(32), n: int = 0xffffffff):
         if len(hash) != 32:
             raise ValueError("COutPoint hash must be 32 bytes")
         self.hash = hash
         self.n = n
+        self._serialized = None
+        self._hash_value = None
 
     def __repr__(self):
         return f"COutPoint(hash={self.hash.hex()}, n={self.n})"
 
     def __hash__(self):
-        return hash((self.hash, self.n))
+        if self._hash_value is None:
+            self._hash_value = hash((self.hash, self.n))
+        return self._hash_value
+
+    def __reduce__(self):
+        # Pickle only the fields: the memoized hash is salted per process and
+        # would be wrong after unpickling in a worker
+        return (self.__class__, (self.hash, self.n))
 
     def __eq__(self, other):
         if not isinstance(other, COutPoint):
@@ -38,7 +67,9 @@ class COutPoint:
         return self.hash == bytes(32) and self.n == 0xffffffff
 
     def serialize(self) -> bytes:
-        return self.hash + self.n.to_bytes(4, 'little')
+        if self._serialized is None:
+            self._serialized = _OUTPOINT.pack(self.hash, self.n)
+        return self._serialized
 
     @classmethod
     def deserialize(cls, stream):
@@ -50,6 +81,8 @@ class COutPoint:
 
 
 class CTxIn:
+    __slots__ = ('prevout', 'scriptSig', 'nSequence')
+
     def __init__(self, prevout: COutPoint, scriptSig: 'CScript', nSequence: int = 0xffffffff):
         self.prevout = prevout
         self.scriptSig = scriptSig
@@ -59,12 +92,25 @@ class CTxIn:
         return f"CTxIn(prevout={self.prevout}, scriptSig={self.scriptSig}, nSequence={self.nSequence})"
 
     def serialize(self) -> bytes:
-        return (
-            self.prevout.serialize() +
-            compact_size(len(self.scriptSig.data)) +
-            self.scriptSig.data +
-            self.nSequence.to_bytes(4, 'little')
-        )
+        return b''.join(self.serialize_fragments())
+
+    def serialized_size(self) -> int:
+        script_size = len(self.scriptSig.data)
+        return 40 + compact_size_len(script_size) + script_size
+
+    def serialize_fragments(self, fragments: Optional[list] = None) -> list:
+        """Appends the serialized fields to fragments (a new list by default)"""
+        if fragments is None:
+            fragments = []
+        script = self.scriptSig.data
+        size = len(script)
+        fragments.extend((
+            self.prevout.serialize(),
+            SMALL_COMPACT_SIZES[size] if size < 0xfd else compact_size(size),
+            script,
+            _SEQUENCE_FINAL_BYTES if self.nSequence == SEQUENCE_FINAL else UINT32.pack(self.nSequence)
+        ))
+        return fragments
 
     @classmethod
     def deserialize(cls, stream):
@@ -77,6 +123,8 @@ class CTxIn:
 
 
 class CTxOut:
+    __slots__ = ('nValue', 'scriptPubKey')
+
     def __init__(self, nValue: int, scriptPubKey: 'CScript'):
         self.nValue = nValue  # Renamed field
         self.scriptPubKey = scriptPubKey  # Case correction
@@ -85,11 +133,24 @@ class CTxOut:
         return f"CTxOut(nValue={self.nValue}, scriptPubKey={self.scriptPubKey.data.hex()})"
 
     def serialize(self) -> bytes:
-        return (
-            self.nValue.to_bytes(8, 'little') +
-            compact_size(len(self.scriptPubKey.data)) +
-            self.scriptPubKey.data
-        )
+        return b''.join(self.serialize_fragments())
+
+    def serialized_size(self) -> int:
+        script_size = len(self.scriptPubKey.data)
+        return 8 + compact_size_len(script_size) + script_size
+
+    def serialize_fragments(self, fragments: Optional[list] = None) -> list:
+        """Appends the serialized fields to fragments (a new list by default)"""
+        if fragments is None:
+            fragments = []
+        script = self.scriptPubKey.data
+        size = len(script)
+        fragments.extend((
+            UINT64.pack(self.nValue),
+            SMALL_COMPACT_SIZES[size] if size < 0xfd else compact_size(size),
+            script
+        ))
+        return fragments
 
     @classmethod
     def deserialize(cls, stream):
@@ -101,6 +162,8 @@ class CTxOut:
 
 
 class CTransaction:
+    __slots__ = ('nVersion', 'vin', 'vout', 'nLockTime')
+
     def __init__(self, nVersion: int = 1, vin: list[CTxIn] = None,
                  vout: list[CTxOut] = None, nLockTime: int = 0):
         self.nVersion = nVersion  # Added version field
@@ -123,32 +186,57 @@ class CTransaction:
 
     def serialize(self):
         """Serializes the transaction into a byte string"""
-        stream = io.BytesIO()
+        return b''.join(self.serialize_fragments())
+
+    def serialized_size(self) -> int:
+        """Exact length of serialize(), computed without serializing"""
+        size = 8 + compact_size_len(len(self.vin)) + compact_size_len(len(self.vout))
+        for txin in self.vin:
+            size += txin.serialized_size()
+        for txout in self.vout:
+            size += txout.serialized_size()
+        return size
+
+    def serialize_fragments(self, fragments: Optional[list] = None) -> list:
+        """
+        Appends the serialization to fragments (a new list by default) as
+        separate byte strings, in wire order, without joining them.
+
+        Callers that combine several objects (e.g. a block) can collect all
+        fragments and join once instead of copying each transaction.
+        """
+        if fragments is None:
+            fragments = []
 
         # Version
-        stream.write(self.nVersion.to_bytes(4, 'little'))
+        fragments.append(UINT32.pack(self.nVersion))
 
         # Inputs
-        stream.write(compact_size(len(self.vin)))
+        fragments.append(compact_size(len(self.vin)))
         for txin in self.vin:
-            stream.write(txin.serialize())
+            txin.serialize_fragments(fragments)
 
         # Outputs
-        stream.write(compact_size(len(self.vout)))
+        fragments.append(compact_size(len(self.vout)))
         for txout in self.vout:
-            stream.write(txout.serialize())
+            txout.serialize_fragments(fragments)
 
         # Lock time
-        stream.write(self.nLockTime.to_bytes(4, 'little'))
-        return stream.getvalue()
+        fragments.append(UINT32.pack(self.nLockTime))
+        return fragments
 
     @classmethod
     def deserialize(cls, stream_or_bytes):
         """Deserialize from either a stream or bytes"""
         if isinstance(stream_or_bytes, bytes):
-            stream = io.BytesIO(stream_or_bytes)
-        else:
-            stream = stream_or_bytes
+            return cls.deserialize_from(stream_or_bytes)[0]
+        stream = stream_or_bytes
+        if isinstance(stream, io.BytesIO):
+            # getvalue() shares the underlying bytes, so decode in place and
+            # advance the stream past the transaction
+            tx, end = cls.deserialize_from(stream.getvalue(), stream.tell())
+            stream.seek(end)
+            return tx
 
         # Version
         nVersion = int.from_bytes(stream.read(4), 'little')
@@ -165,6 +253,62 @@ class CTransaction:
         nLockTime = int.from_bytes(stream.read(4), 'little')
         return cls(nVersion, vin, vout, nLockTime)
 
+    @classmethod
+    def deserialize_from(cls, buf: bytes, offset: int = 0) -> tuple['CTransaction', int]:
+        """
+        Decodes a transaction at buf[offset] without an intermediate stream.
+
+        Returns:
+            tuple: (transaction, offset just past its last byte)
+
+        Raises:
+            ValueError: If buf ends before the transaction does.
+        """
+        try:
+            # Version
+            nVersion = UINT32.unpack_from(buf, offset)[0]
+
+            # Inputs. Each is decoded inline (outpoint and the first script size
+            # byte in one unpack) rather than through per-object helper calls
+            buf_len = len(buf)
+            txin_count, offset = read_compact_size_from(buf, offset + 4)
+            vin = []
+            while txin_count:
+                hash, n, script_size = _TXIN_HEAD.unpack_from(buf, offset)
+                if script_size < 0xfd:
+                    offset += 37
+                else:
+                    script_size, offset = read_compact_size_from(buf, offset + 36)
+                end = offset + script_size
+                if end > buf_len:
+                    raise ValueError("Insufficient data for scriptSig")
+                nSequence = UINT32.unpack_from(buf, end)[0]
+                vin.append(CTxIn(COutPoint(hash, n), CScript(buf[offset:end]), nSequence))
+                offset = end + 4
+                txin_count -= 1
+
+            # Outputs
+            txout_count, offset = read_compact_size_from(buf, offset)
+            vout = []
+            while txout_count:
+                nValue, script_size = _TXOUT_HEAD.unpack_from(buf, offset)
+                if script_size < 0xfd:
+                    offset += 9
+                else:
+                    script_size, offset = read_compact_size_from(buf, offset + 8)
+                end = offset + script_size
+                if end > buf_len:
+                    raise ValueError("Insufficient data for scriptPubKey")
+                vout.append(CTxOut(nValue, CScript(buf[offset:end])))
+                offset = end
+                txout_count -= 1
+
+            # Lock time
+            nLockTime = UINT32.unpack_from(buf, offset)[0]
+        except struct.error:
+            raise ValueError("Unexpected end of transaction data") from None
+        return cls(nVersion, vin, vout, nLockTime), offset + 4
+
     def get_hash(self):
         """Calculates the transaction hash"""
         raw_transaction = self.serialize()
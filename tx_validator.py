@@ -1,8 +1,26 @@
+import os
 import time
-from interpreter import verify_script
+
+from crypto import HAVE_LIBSECP256K1
+from crypto import hash256
+from interpreter import verify_script_with_hash
+from interpreter import verify_scripts_parallel
 from transaction import CTransaction
 from utxo import UTXOSet
 
+# Maximum number of satoshis that can ever exist (21 million BTC)
+MAX_MONEY = 21_000_000 * 100_000_000
+
+# Script checks are farmed out to worker processes only when that can pay
+# off: more than one CPU, and the pure-Python ECDSA backend (about 4ms per
+# signature). With libsecp256k1 a check takes tens of microseconds, less
+# than shipping the transaction to a worker.
+PARALLEL_VERIFY = not HAVE_LIBSECP256K1 and (os.cpu_count() or 1) > 1
+
+# Inputs needed before the pool is used; below this the per-call pickling
+# and scheduling overhead outweighs the signature work saved
+PARALLEL_VERIFY_MIN_INPUTS = 16
+
 
 class TransactionValidationError(Exception): pass
 
@@ -15,12 +33,15 @@ def validate_transaction(tx: CTransaction, utxo_set: UTXOSet, block_height: int)
             raise TransactionValidationError("No inputs in non-coinbase tx")
     
     # 1. Basic structural validation
+    # Serializing packs every field, so out-of-range or mistyped values are
+    # rejected here. The bytes are kept and hashed once, for the script
+    # checks, after the cheap checks have passed.
     try:
         raw_tx = tx.serialize()
-        if len(raw_tx) > 1000000:  # Bitcoin Core MAX_STANDARD_TX_WEIGHT
-            raise TransactionValidationError("Oversized transaction")
     except Exception as e:
         raise TransactionValidationError(f"Serialization error: {str(e)}")
+    if len(raw_tx) > 1000000:  # Bitcoin Core MAX_STANDARD_TX_WEIGHT
+        raise TransactionValidationError("Oversized transaction")
 
     # 2. Coinbase-specific checks
     if tx.is_coinbase():
@@ -30,17 +51,14 @@ def validate_transaction(tx: CTransaction, utxo_set: UTXOSet, block_height: int)
 
     # 3. Input validation
     input_values = []
+    spent_utxos = []  # Looked up once here, reused by script verification
     for i, txin in enumerate(tx.vin):
-        # Check UTXO existence
-        prevout = txin.prevout
-        if not utxo_set.is_unspent(prevout):
-            raise TransactionValidationError(f"Input {i} spends non-existent UTXO")
-        
         # Get referenced UTXO
-        utxo = utxo_set.utxos.get(prevout)
-        if not utxo:
-            raise TransactionValidationError(f"Missing UTXO for {prevout}")
-        
+        utxo = utxo_set.get(txin.prevout)
+        if utxo is None:
+            raise TransactionValidationError(f"Input {i} spends non-existent UTXO")
+        spent_utxos.append(utxo)
+
         # Check coinbase maturity
         if utxo.coinbase:
             if (block_height - utxo.height) < 100:
@@ -50,7 +68,8 @@ def validate_transaction(tx: CTransaction, utxo_set: UTXOSet, block_height: int)
 
     # 4. Output validation
     output_values = [txout.nValue for txout in tx.vout]
-    if any(v < 0 or v > 2100000000000000 for v in output_values):
+    # min()/max() scan the list in C instead of a generator step per output
+    if output_values and (min(output_values) < 0 or max(output_values) > MAX_MONEY):
         raise TransactionValidationError("Invalid output value")
 
     # 5. Fee calculation
@@ -59,16 +78,23 @@ def validate_transaction(tx: CTransaction, utxo_set: UTXOSet, block_height: int)
     if total_in < total_out:
         raise TransactionValidationError("Insufficient input value")
 
-    # 6. Script verification
-    for i, txin in enumerate(tx.vin):
-        utxo = utxo_set.utxos[txin.prevout]
-        if not verify_script(txin.scriptSig, utxo.tx_out.scriptPubKey, tx, i):
-            raise TransactionValidationError(f"Script verification failed for input {i}")
-
-    # 7. Locktime check
+    # 6. Locktime check
     if tx.nLockTime != 0:
         locktime_met = (tx.nLockTime < block_height) if tx.nLockTime < 500000000 else (tx.nLockTime < int(time.time()))
         if not locktime_met:
             raise TransactionValidationError("Locktime not met")
 
+    # 7. Script verification (by far the most expensive step, so it runs last)
+    tx_hash = hash256(raw_tx)  # Same as tx.get_hash(), without re-serializing
+    if PARALLEL_VERIFY and len(tx.vin) >= PARALLEL_VERIFY_MIN_INPUTS:
+        checks = [(txin.scriptSig, utxo.tx_out.scriptPubKey, tx, i)
+                  for i, (txin, utxo) in enumerate(zip(tx.vin, spent_utxos))]
+        for i, ok in enumerate(verify_scripts_parallel(checks, tx_hash=tx_hash)):
+            if not ok:
+                raise TransactionValidationError(f"Script verification failed for input {i}")
+    else:
+        for i, (txin, utxo) in enumerate(zip(tx.vin, spent_utxos)):
+            if not verify_script_with_hash(txin.scriptSig, utxo.tx_out.scriptPubKey, tx, i, tx_hash):
+                raise TransactionValidationError(f"Script verification failed for input {i}")
+
     return True
@@ -1,8 +1,7 @@
-import copy
+import struct
 from typing import Dict, Optional
 
 from block import CBlock
-from crypto import hash160
 from transaction import COutPoint
 from transaction import CTxIn
 from transaction import CTxOut
@@ -12,7 +11,18 @@ from script import is_op_return
 from script_utils import ScriptBuilder
 
 
+def _lookup_key(prevout: 'COutPoint') -> Optional[bytes]:
+    """UTXO set key for prevout, or None if its fields cannot be serialized
+    (an out-of-range or non-int n, say), in which case it is never in the set"""
+    try:
+        return prevout.serialize()
+    except struct.error:
+        return None
+
+
 class UTXO:
+    __slots__ = ('height', 'coinbase', 'tx_out', 'prevout')
+
     def __init__(self, prevout: 'COutPoint', tx_out: 'CTxOut', height: int, coinbase: bool):
         self.height = height        # The height of the block containing the UTXO
         self.coinbase = coinbase    # Whether the UTXO comes from a coinbase transaction or not.
@@ -23,20 +33,52 @@ class UTXO:
 
 class UTXOSet:
     def __init__(self):
-        self.utxos: Dict['COutPoint', 'UTXO'] = {}
-        self.spent_utxos: Dict['COutPoint', 'UTXO'] = {}  # Added spent UTXO cache
+        # Keyed by the outpoint's 36-byte serialization (memoized on COutPoint),
+        # which hashes and compares in C instead of through COutPoint.__eq__
+        self.utxos: Dict[bytes, 'UTXO'] = {}
+        self.spent_utxos: Dict[bytes, 'UTXO'] = {}  # Added spent UTXO cache
+        # Running balances, kept in step with utxos so get_balance is O(1)
+        self._balance_by_script: Dict[bytes, int] = {}
+        self._total = 0
+
+    def _insert(self, utxo: 'UTXO'):
+        """Stores utxo and credits its value to the balance index"""
+        key = utxo.prevout.serialize()
+        replaced = self.utxos.get(key)
+        if replaced is not None:
+            self._debit(replaced.tx_out)
+        self.utxos[key] = utxo
+        tx_out = utxo.tx_out
+        script = tx_out.scriptPubKey.data
+        self._balance_by_script[script] = self._balance_by_script.get(script, 0) + tx_out.nValue
+        self._total += tx_out.nValue
+
+    def _remove(self, prevout: 'COutPoint') -> 'UTXO':
+        """Removes the UTXO at prevout and debits its value from the balance index"""
+        utxo = self.utxos.pop(prevout.serialize())
+        self._debit(utxo.tx_out)
+        return utxo
+
+    def _debit(self, tx_out: 'CTxOut'):
+        """Subtracts tx_out's value from the balance index, dropping emptied scripts"""
+        script = tx_out.scriptPubKey.data
+        balance = self._balance_by_script.get(script, 0) - tx_out.nValue
+        if balance:
+            self._balance_by_script[script] = balance
+        else:
+            self._balance_by_script.pop(script, None)
+        self._total -= tx_out.nValue
 
     def update_from_block(self, block: 'CBlock', height: int):
         """Process all transactions in a block (spend inputs and add outputs)"""
-        # First: Process inputs (spend UTXOs)
+        # One pass in block order: a transaction may spend outputs created
+        # earlier in the same block, never later ones
         for tx in block.vtx:
-            if not tx.is_coinbase():
+            is_coinbase = tx.is_coinbase()
+            if not is_coinbase:
                 for tx_in in tx.vin:
                     self.spend(tx_in.prevout)
 
-        # Then: Add outputs as new UTXOs
-        for tx in block.vtx:
-            is_coinbase = tx.is_coinbase()
             tx_hash = tx.get_hash()
             for i, tx_out in enumerate(tx.vout):
                 # Skip OP_RETURN outputs as they are unspendable
@@ -44,49 +86,57 @@ class UTXOSet:
                     continue
 
                 prevout = COutPoint(tx_hash, i)
-                self.utxos[prevout] = UTXO(
+                self._insert(UTXO(
                     prevout=prevout,
                     tx_out=tx_out,
                     height=height,
                     coinbase=is_coinbase
-                )
+                ))
 
     def disconnect_block(self, block: 'CBlock'):
         """Undo block effects on UTXO set"""
-        # 1. Remove created outputs
-        for tx in block.vtx:
+        # Undo transactions in reverse order so outputs spent within the
+        # block are restored before the transaction that created them is undone
+        for tx in reversed(block.vtx):
+            # 1. Remove created outputs
             tx_hash = tx.get_hash()
-            for i in range(len(tx.vout)):
+            for i, tx_out in enumerate(tx.vout):
+                # OP_RETURN outputs were never added (see update_from_block)
+                if is_op_return(tx_out.scriptPubKey):
+                    continue
                 prevout = COutPoint(tx_hash, i)
-                del self.utxos[prevout]
-  
-        # 2. Restore spent inputs
-        for tx in block.vtx[1:]:  # Skip coinbase
-            for txin in tx.vin:
-                self.utxos[txin.prevout] = self.spent_utxos[txin.prevout]
+                self._remove(prevout)
+
+            # 2. Restore spent inputs
+            if not tx.is_coinbase():
+                for txin in tx.vin:
+                    self._insert(self.spent_utxos[txin.prevout.serialize()])
 
     def add(self, utxo: 'UTXO'):
         if not isinstance(utxo, UTXO):
             raise TypeError("Cannot add non-UTXO objects")
-        self.utxos[utxo.prevout] = utxo
+        self._insert(utxo)
 
     def spend(self, prevout: 'COutPoint'):
-        if prevout not in self.utxos:
+        if _lookup_key(prevout) not in self.utxos:
             raise ValueError(f"UTXO not found: {prevout}")
-        # Cache spent UTXO for potential restoration
-        self.spent_utxos[prevout] = self.utxos[prevout]
-        del self.utxos[prevout]
+        # Cache spent UTXO for potential restoration. The same object is kept
+        # (no copy): UTXOs are never modified after creation, so
+        # disconnect_block can put it back as is
+        self.spent_utxos[prevout.serialize()] = self._remove(prevout)
 
     def is_unspent(self, prevout: 'COutPoint'):
-        return prevout in self.utxos
+        return _lookup_key(prevout) in self.utxos
+
+    def get(self, prevout: 'COutPoint') -> Optional['UTXO']:
+        """Returns the unspent output at prevout, or None if there is none"""
+        return self.utxos.get(_lookup_key(prevout))
 
     def get_balance(self, script_pubkey: Optional['CScript'] = None) -> int:
         """Calculate balance filtered by scriptPubKey (if provided)"""
-        total = 0
-        for utxo in self.utxos.values():
-            if script_pubkey is None or utxo.tx_out.scriptPubKey == script_pubkey:
-                total += utxo.tx_out.nValue
-        return total
+        if script_pubkey is None:
+            return self._total
+        return self._balance_by_script.get(script_pubkey.data, 0)
 
     def __repr__(self):
         return f"UTXOSet({list(self.utxos.values())})"
@@ -134,9 +184,11 @@ def main():
         for tx_in in tx.vin:
             utxo_set.spend(tx_in.prevout)
 
+    tx_hash = tx.get_hash()
+    is_coinbase = tx.is_coinbase()
     for index, tx_out in enumerate(tx.vout):
-        outpoint = COutPoint(tx.get_hash(), index)
-        new_utxo = UTXO(outpoint, tx_out, height, tx.is_coinbase())
+        outpoint = COutPoint(tx_hash, index)
+        new_utxo = UTXO(outpoint, tx_out, height, is_coinbase)
         utxo_set.add(new_utxo)
 
     wallet_balance = utxo_set.get_balance(p2pkh_script)
@@ -1,4 +1,4 @@
-import copy
+import hashlib
 
 from crypto import hash160
 from crypto import hash256
@@ -109,8 +109,12 @@ class Wallet:
             A new CTransaction object with the scriptSig field in the inputs
             populated with the signatures.
         """
-        new_transaction = CTransaction(vin=copy.deepcopy(transaction.vin),
-                                        vout=copy.deepcopy(transaction.vout))
+        # Only the scriptSigs change, so copy the inputs and share the
+        # (never mutated) outpoints, scripts and outputs
+        new_transaction = CTransaction(
+            vin=[CTxIn(tx_in.prevout, tx_in.scriptSig, tx_in.nSequence) for tx_in in transaction.vin],
+            vout=list(transaction.vout)
+        )
 
         # Sign the transaction hash for each input
         for i, tx_in in enumerate(new_transaction.vin):
@@ -124,6 +128,26 @@ class Wallet:
 
         return new_transaction
 
+    @staticmethod
+    def sign_multi(tx, input_index, script_code, sighash_type, signing_keys):
+        """
+        Signs one input with several keys, hashing the transaction only once.
+
+        Args:
+            tx: The CTransaction being signed.
+            input_index: Index of the input the signatures are for.
+            script_code: The script the sighash commits to (the multisig
+                scriptPubKey, or the redeem script for P2SH).
+            sighash_type: The SIGHASH type appended to every signature.
+            signing_keys: The ecdsa SigningKeys to sign with.
+
+        Returns:
+            One signature per key, in the order of signing_keys.
+        """
+        sighash = signature_hash(tx, input_index, script_code, sighash_type)
+        sighash_byte = bytes([sighash_type])
+        return [sk.sign(sighash, hashfunc=hashlib.sha256) + sighash_byte for sk in signing_keys]
+
     def verify(self, message, signature):
         """
         Verifies the authenticity of a signature using the wallet's public key.